@@ -1,16 +1,74 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.background import BackgroundTask
+from contextlib import asynccontextmanager
+import asyncio
+import concurrent.futures
+import multiprocessing
+import shutil
 import tempfile
 import os
 import logging
-from model_smoother import process_model
+
+# Split the CPUs between the uvicorn workers (uvicorn reads WEB_CONCURRENCY
+# as its default --workers) and the pool processes inside each of them, and
+# cap the native thread pools to match so the machine is not oversubscribed.
+# The caps must be in the environment before model_smoother imports Numba
+# and Open3D; spawned pool processes inherit them.
+CPU_COUNT = os.cpu_count() or 1
+SERVER_WORKERS = max(1, int(os.environ.get("WEB_CONCURRENCY", "1")))
+POOL_WORKERS = max(1, CPU_COUNT // SERVER_WORKERS)
+THREADS_PER_WORKER = max(1, CPU_COUNT // (SERVER_WORKERS * POOL_WORKERS))
+for _var in ("OMP_NUM_THREADS", "NUMBA_NUM_THREADS"):
+    os.environ.setdefault(_var, str(THREADS_PER_WORKER))
+
+from model_smoother import process_model  # noqa: E402
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="GLB Model Processor API")
+# Size of each read/write when copying uploads to disk
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+def create_executor():
+    """
+    Create the worker pool for the CPU-bound pipeline, so uploads are
+    processed in parallel instead of contending for this process's GIL
+    
+    Workers are spawned rather than forked so they start with fresh
+    OpenMP and Numba thread pools.
+    """
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=POOL_WORKERS,
+        mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+EXECUTOR = create_executor()
+
+
+def replace_broken_executor(broken):
+    """
+    Swap in a fresh pool after a worker died, so one crash does not fail
+    every later request with BrokenProcessPool
+    """
+    global EXECUTOR
+    if EXECUTOR is broken:
+        logger.warning("A processing worker died, starting a new pool")
+        EXECUTOR = create_executor()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    yield
+    EXECUTOR.shutdown(wait=True, cancel_futures=True)
+
+
+app = FastAPI(title="GLB Model Processor API", lifespan=lifespan)
 
 # Enable CORS
 app.add_middleware(
@@ -55,42 +113,61 @@ async def process_glb(
     output_path = None
     
     try:
-        # Save uploaded file to temporary location
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.glb') as tmp_input:
-            content = await file.read()
-            tmp_input.write(content)
-            input_path = tmp_input.name
-            logger.info(f"Saved input file to: {input_path}")
+        # Copy the spooled upload to a temporary location in 1 MB chunks on
+        # a worker thread, without materializing it in memory
+        fd, input_path = tempfile.mkstemp(suffix='.glb')
+        with os.fdopen(fd, 'wb') as tmp_input:
+            await asyncio.to_thread(shutil.copyfileobj, file.file, tmp_input, UPLOAD_CHUNK_SIZE)
+        logger.info(f"Saved input file to: {input_path}")
         
         # Create output path
         output_path = input_path.replace('.glb', '_processed.glb')
         
         # Process the model
         logger.info(f"Starting processing with {smooth_iterations} iterations, remove_bumps={remove_bumps}")
-        success = process_model(
-            input_path, 
-            output_path, 
-            smooth_iterations=smooth_iterations, 
-            remove_bumps=remove_bumps
-        )
+        # Run the CPU-bound pipeline in the process pool so the event loop
+        # keeps serving other requests
+        executor = EXECUTOR
+        try:
+            success = await asyncio.get_running_loop().run_in_executor(
+                executor,
+                process_model,
+                input_path,
+                output_path,
+                smooth_iterations,
+                remove_bumps
+            )
+        except concurrent.futures.process.BrokenProcessPool:
+            replace_broken_executor(executor)
+            raise
         
         if not success:
             raise HTTPException(status_code=500, detail="Model processing failed")
         
         logger.info(f"Processing complete, output saved to: {output_path}")
         
-        # Return the processed file
+        # Return the processed file and delete it once it has been sent
         return FileResponse(
             output_path,
             media_type="model/gltf-binary",
             filename="smoothed-model.glb",
             headers={
                 "Content-Disposition": "attachment; filename=smoothed-model.glb"
-            }
+            },
+            background=BackgroundTask(os.unlink, output_path)
         )
     
     except Exception as e:
         logger.error(f"Error processing file: {str(e)}", exc_info=True)
+        
+        # No response will be sent, so clean up any partial output now
+        if output_path and os.path.exists(output_path):
+            try:
+                os.unlink(output_path)
+                logger.info(f"Cleaned up output file: {output_path}")
+            except Exception as cleanup_error:
+                logger.warning(f"Failed to clean up output file: {cleanup_error}")
+        
         raise HTTPException(status_code=500, detail=f"Processing error: {str(e)}")
     
     finally:
@@ -101,8 +178,6 @@ async def process_glb(
                 logger.info(f"Cleaned up input file: {input_path}")
             except Exception as e:
                 logger.warning(f"Failed to clean up input file: {e}")
-        
-        # Note: output_path is returned as FileResponse, so it will be cleaned up by FastAPI
 
 if __name__ == "__main__":
     import uvicorn
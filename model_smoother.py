@@ -3,12 +3,43 @@
 This script smooths a textured GLB model while preserving textures
 """
 
+import functools
+import logging
+import os
+import tempfile
+import zipfile
 import open3d as o3d
 import numpy as np
+import scipy.sparse as sp
+import xxhash
+from scipy.sparse.linalg import cg
+from scipy.spatial import cKDTree
+from smoothing_kernels import cotan_smooth
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
 
-def load_glb_model(file_path):
+# On-disk cache of assembled input-mesh Laplacians, shared across requests
+# and processes, capped at LAPLACIAN_CACHE_MAX_BYTES in total
+LAPLACIAN_CACHE_DIR = Path(tempfile.gettempdir()) / "smoother_cache"
+LAPLACIAN_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Relative residual tolerance and iteration cap for the implicit smoothing
+# solves
+CG_RTOL = 1e-6
+CG_MAXITER = 1000
+
+# Upper bound on cotangent weights (about cot(0.6 degrees)); sliver
+# triangles otherwise get weights of |e|^2 / eps and make the implicit
+# system too ill-conditioned to solve
+COTANGENT_MAX = 100.0
+
+# Threads for cKDTree queries; follows the OpenMP cap so that pooled
+# workers do not each use every core
+KDTREE_WORKERS = int(os.environ.get("OMP_NUM_THREADS", "-1"))
+
+
+def load_glb_model(file_path: str | Path) -> o3d.geometry.TriangleMesh:
     """
     Load a GLB file and extract mesh
     
@@ -21,7 +52,7 @@ def load_glb_model(file_path):
     print(f"Loading model from {file_path}...")
     
     # Open3D supports GLB/GLTF through the read_triangle_mesh function
-    mesh = o3d.io.read_triangle_mesh(str(file_path))
+    mesh = o3d.io.read_triangle_mesh(str(file_path))  # type: ignore[arg-type]
     
     if not mesh.has_vertices():
         raise ValueError("Failed to load mesh from GLB file")
@@ -30,44 +61,297 @@ def load_glb_model(file_path):
     return mesh
 
 
-def smooth_mesh_preserve_texture(mesh, iterations=5, lambda_filter=0.5):
+def _cotangent_laplacian(vertices: np.ndarray, triangles: np.ndarray) -> sp.csr_matrix:
+    """
+    Build the sparse cotangent Laplacian of a triangle mesh
+    
+    Every triangle contributes 0.5 * cot(angle) to the edge opposite each of
+    its corners, so each edge ends up with w_ij = 0.5 * (cot a + cot b).
+    Cotangents are clamped to [0, COTANGENT_MAX], so the matrix stays
+    diagonally dominant on meshes with obtuse triangles and bounded on
+    sliver triangles. They are computed in float64, whose degeneracy floor
+    is far below the squared edge length of any real part, and only the
+    weights are cast back to the vertex dtype.
+    
+    Args:
+        vertices: (N, 3) array of vertex positions
+        triangles: (F, 3) array of vertex indices
+        
+    Returns:
+        scipy.sparse.csr_matrix: (N, N) Laplacian with sum(w_ik) on the
+        diagonal and -w_ij off the diagonal
+    """
+    n = len(vertices)
+    corners = vertices[triangles].astype(np.float64)
+    
+    # For corner k, the angle is between the two edges leaving it, and the
+    # weight goes to the opposite edge (k+1, k+2)
+    e1 = np.roll(corners, -1, axis=1) - corners
+    e2 = np.roll(corners, -2, axis=1) - corners
+    dots = np.einsum('fkd,fkd->fk', e1, e2)
+    cross_norms = np.linalg.norm(np.cross(e1, e2), axis=2)
+    cot = dots / np.maximum(cross_norms, np.finfo(cross_norms.dtype).eps)
+    weights = (0.5 * np.clip(cot, 0.0, COTANGENT_MAX)).astype(vertices.dtype)
+    
+    rows = np.roll(triangles, -1, axis=1).ravel()
+    cols = np.roll(triangles, -2, axis=1).ravel()
+    weights = weights.ravel()
+    
+    # Symmetric off-diagonal entries; duplicates (the two triangles sharing
+    # an edge) are summed by the COO -> CSR conversion
+    W = sp.coo_matrix(
+        (np.concatenate([weights, weights]), (np.concatenate([rows, cols]), np.concatenate([cols, rows]))),
+        shape=(n, n)
+    ).tocsr()
+    
+    return (sp.diags(np.asarray(W.sum(axis=1)).ravel()) - W).tocsr()
+
+
+def _save_cached_laplacian(cache_path: Path, L: sp.csr_matrix) -> None:
+    """
+    Atomically write a Laplacian to the on-disk cache, evicting the least
+    recently used entries once the cache exceeds LAPLACIAN_CACHE_MAX_BYTES
+    
+    Args:
+        cache_path: Destination .npz path inside LAPLACIAN_CACHE_DIR
+        L: Sparse matrix to store
+    """
+    LAPLACIAN_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    
+    # Write next to the target and rename so concurrent readers never see
+    # a partial file
+    fd, tmp_path = tempfile.mkstemp(suffix='.npz', dir=LAPLACIAN_CACHE_DIR)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            sp.save_npz(f, L, compressed=False)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    
+    # Other workers may evict entries concurrently, so skip files that have
+    # already gone
+    entries = []
+    for entry in LAPLACIAN_CACHE_DIR.glob("smoother_*.npz"):
+        try:
+            entries.append((entry.stat(), entry))
+        except FileNotFoundError:
+            pass
+    entries.sort(key=lambda e: e[0].st_mtime, reverse=True)
+    
+    total_bytes = 0
+    for stat, entry in entries:
+        total_bytes += stat.st_size
+        if total_bytes > LAPLACIAN_CACHE_MAX_BYTES:
+            entry.unlink(missing_ok=True)
+
+
+@functools.lru_cache(maxsize=1)
+def _laplacian_matrix(tri_bytes: bytes, vert_bytes: bytes, n_verts: int,
+                      persist: bool = False) -> sp.csr_matrix:
+    """
+    Build the cotangent Laplacian, memoized on the raw triangle/vertex buffers
+    
+    The in-process cache holds only the most recent mesh, so repeated
+    smoothing of one model reuses it without pinning large matrices and
+    buffer keys in every worker. With persist, the matrix is also stored
+    in LAPLACIAN_CACHE_DIR keyed by an xxh3 hash of the buffers, so later
+    requests for the same model skip the assembly. Only the input mesh is
+    worth persisting; intermediate meshes depend on every request
+    parameter and would rarely be hit.
+    
+    Args:
+        tri_bytes: Triangle indices as int32 bytes
+        vert_bytes: Vertex positions as float32 bytes
+        n_verts: Number of vertices
+        persist: Whether to read and write the on-disk cache
+        
+    Returns:
+        scipy.sparse.csr_matrix: (N, N) cotangent Laplacian
+    """
+    vertices = np.frombuffer(vert_bytes, dtype=np.float32).reshape(n_verts, 3)
+    triangles = np.frombuffer(tri_bytes, dtype=np.int32).reshape(-1, 3)
+    if not persist:
+        return _cotangent_laplacian(vertices, triangles)
+    
+    hasher = xxhash.xxh3_64(tri_bytes)
+    hasher.update(vert_bytes)
+    cache_path = LAPLACIAN_CACHE_DIR / f"smoother_{hasher.hexdigest()}.npz"
+    
+    # Truncated or foreign files are rebuilt rather than raised
+    try:
+        L = sp.load_npz(cache_path).tocsr()
+        os.utime(cache_path)
+        return L
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+        pass
+    
+    L = _cotangent_laplacian(vertices, triangles)
+    
+    try:
+        _save_cached_laplacian(cache_path, L)
+    except OSError as e:
+        logger.warning(f"Failed to cache Laplacian to {cache_path}: {e}")
+    
+    return L
+
+
+@functools.lru_cache(maxsize=1)
+def _uniform_laplacian(tri_bytes: bytes, n_verts: int) -> sp.csr_matrix:
+    """
+    Build the valence-normalized uniform Laplacian D^-1 A - I of a mesh
+    
+    Depends on topology only, so it is memoized on the triangle buffer.
+    
+    Args:
+        tri_bytes: Triangle indices as int32 bytes
+        n_verts: Number of vertices
+        
+    Returns:
+        scipy.sparse.csr_matrix: (N, N) float32 Laplacian
+    """
+    triangles = np.frombuffer(tri_bytes, dtype=np.int32).reshape(-1, 3)
+    
+    # One entry per directed edge of every triangle; shared edges collapse
+    # to a single 1 after deduplication
+    rows = triangles.ravel()
+    cols = np.roll(triangles, -1, axis=1).ravel()
+    A = sp.coo_matrix(
+        (np.ones(2 * len(rows), dtype=np.float32), (np.concatenate([rows, cols]), np.concatenate([cols, rows]))),
+        shape=(n_verts, n_verts)
+    ).tocsr()
+    A.data[:] = 1.0
+    
+    # Unreferenced vertices get an all-zero row so smoothing leaves them in
+    # place instead of pulling them towards the origin
+    valence = np.asarray(A.sum(axis=1)).ravel()
+    referenced = valence > 0
+    inv_valence = np.divide(1.0, valence, out=np.zeros_like(valence), where=referenced)
+    return (sp.diags(inv_valence) @ A - sp.diags(referenced.astype(np.float32))).astype(np.float32).tocsr()
+
+
+def _scipy_taubin(vertices: np.ndarray, triangles: np.ndarray, iterations: int,
+                  lam: float, mu: float) -> np.ndarray:
+    """
+    Explicit Taubin smoothing as two sparse matrix products per iteration
+    
+    Args:
+        vertices: (N, 3) float32 array of vertex positions
+        triangles: (F, 3) int32 array of triangle indices
+        iterations: Number of lambda/mu iteration pairs
+        lam: Shrinking step factor
+        mu: Inflation step factor (negative)
+        
+    Returns:
+        np.ndarray: (N, 3) float32 array of smoothed vertex positions
+    """
+    L = _uniform_laplacian(np.ascontiguousarray(triangles).tobytes(), len(vertices))
+    
+    V = vertices.copy()
+    for _ in range(iterations):
+        V += lam * (L @ V)
+        V += mu * (L @ V)
+    
+    return V
+
+
+def _implicit_smooth(vertices: np.ndarray, triangles: np.ndarray, iterations: int,
+                     lambda_filter: float) -> np.ndarray:
+    """
+    Implicit cotangent-Laplacian smoothing, solving (I + lambda * L) X = V
+    
+    I + lambda * L is symmetric positive definite, so each coordinate is
+    solved with Jacobi-preconditioned conjugate gradients, warm-started from
+    the previous iterate. That stays linear in the mesh size, unlike a
+    sparse LU factorization whose fill-in grows much faster. If a solve
+    does not converge within CG_MAXITER iterations, the mesh is smoothed
+    with the uniform-Laplacian Taubin backend instead.
+    
+    Args:
+        vertices: (N, 3) float32 array of vertex positions
+        triangles: (F, 3) int32 array of triangle indices
+        iterations: Number of solves
+        lambda_filter: Smoothing strength
+        
+    Returns:
+        np.ndarray: (N, 3) array of smoothed vertex positions
+    """
+    n_verts = len(vertices)
+    # Smoothing runs on the uploaded mesh, the one Laplacian worth keeping
+    # on disk for repeat requests
+    L = _laplacian_matrix(
+        np.ascontiguousarray(triangles).tobytes(),
+        np.ascontiguousarray(vertices).tobytes(),
+        n_verts,
+        persist=True
+    )
+    A = (sp.identity(n_verts, dtype=L.dtype, format='csr') + lambda_filter * L).tocsr()
+    preconditioner = sp.diags(1.0 / A.diagonal())
+    
+    smoothed = vertices.copy()
+    for _ in range(iterations):
+        for d in range(3):
+            solution, info = cg(A, smoothed[:, d], x0=smoothed[:, d], rtol=CG_RTOL,
+                                maxiter=CG_MAXITER, M=preconditioner)
+            if info != 0:
+                logger.warning(f"Smoothing solve did not converge in {CG_MAXITER} iterations, "
+                               "falling back to uniform Taubin smoothing")
+                return _scipy_taubin(vertices, triangles, iterations, lambda_filter, -lambda_filter - 0.01)
+            smoothed[:, d] = solution
+    
+    # Implicit smoothing shrinks the surface; rescale about the centroid so
+    # the RMS radius matches the input (good for 3D printing)
+    centroid = vertices.mean(axis=0)
+    smoothed_centroid = smoothed.mean(axis=0)
+    original_radius = np.sqrt(((vertices - centroid) ** 2).sum(axis=1).mean())
+    smoothed_radius = np.sqrt(((smoothed - smoothed_centroid) ** 2).sum(axis=1).mean())
+    if smoothed_radius > 0:
+        smoothed = (smoothed - smoothed_centroid) * (original_radius / smoothed_radius) + centroid
+    
+    return smoothed
+
+
+def smooth_mesh_preserve_texture(mesh: o3d.geometry.TriangleMesh, iterations: int = 5,
+                                 lambda_filter: float = 0.5,
+                                 backend: str = 'implicit') -> o3d.geometry.TriangleMesh:
     """
     Smooth mesh while preserving texture coordinates
-    Uses Taubin smoothing which prevents shrinkage
+    The 'implicit' backend solves (I + lambda * L) X = V with conjugate
+    gradients once per iteration; the 'numba' backend runs
+    multi-threaded cotangent Taubin smoothing; the 'scipy' backend runs
+    uniform-Laplacian Taubin smoothing as sparse matrix products
     
     Args:
         mesh: Input triangle mesh
         iterations: Number of smoothing iterations
         lambda_filter: Smoothing strength (0.5 is recommended)
+        backend: Smoothing implementation, 'implicit', 'numba' or 'scipy'
         
     Returns:
         o3d.geometry.TriangleMesh: Smoothed mesh
     """
     print(f"Smoothing mesh with {iterations} iterations...")
     
-    # Store texture coordinates and vertex colors
-    has_texture_coords = mesh.has_triangle_uvs()
-    has_vertex_colors = mesh.has_vertex_colors()
-    has_vertex_normals = mesh.has_vertex_normals()
+    # float32 is plenty for visual meshes and halves the memory traffic of
+    # the smoothing kernels; Open3D gets float64 back at the end
+    vertices = np.asarray(mesh.vertices, dtype=np.float32)
+    triangles = np.asarray(mesh.triangles, dtype=np.int32)
+    
+    if backend == 'implicit':
+        smoothed = _implicit_smooth(vertices, triangles, iterations, lambda_filter)
+    elif backend == 'numba':
+        # Taubin smoothing (prevents shrinkage) with the inflation step
+        # just past the shrinking step
+        smoothed = cotan_smooth(vertices, triangles, iterations, lambda_filter, -lambda_filter - 0.01)
+    elif backend == 'scipy':
+        smoothed = _scipy_taubin(vertices, triangles, iterations, lambda_filter, -lambda_filter - 0.01)
+    else:
+        raise ValueError(f"Unknown smoothing backend: {backend}")
     
-    texture_coords = mesh.triangle_uvs if has_texture_coords else None
-    vertex_colors = np.asarray(mesh.vertex_colors) if has_vertex_colors else None
-    
-    # Apply Taubin smoothing (prevents shrinkage, good for 3D printing)
-    # This is a variant of Laplacian smoothing with inflation steps
-    mesh_smoothed = mesh.filter_smooth_taubin(
-        number_of_iterations=iterations,
-        lambda_filter=lambda_filter,
-        mu=-lambda_filter - 0.01  # Inflation factor
-    )
-    
-    # Restore texture coordinates (they don't change with vertex smoothing)
-    if has_texture_coords and texture_coords is not None:
-        mesh_smoothed.triangle_uvs = texture_coords
-        
-    # Restore vertex colors if present
-    if has_vertex_colors and vertex_colors is not None:
-        mesh_smoothed.vertex_colors = o3d.utility.Vector3dVector(vertex_colors)
+    # Only the vertex positions change; the copy carries texture coordinates,
+    # textures and vertex colors over in C++ without a round-trip through Python
+    mesh_smoothed = o3d.geometry.TriangleMesh(mesh)
+    mesh_smoothed.vertices = o3d.utility.Vector3dVector(np.asarray(smoothed, dtype=np.float64))
     
     # Recompute normals for better rendering
     mesh_smoothed.compute_vertex_normals()
@@ -76,47 +360,317 @@ def smooth_mesh_preserve_texture(mesh, iterations=5, lambda_filter=0.5):
     return mesh_smoothed
 
 
-def remove_noise_and_bumps(mesh, voxel_size=0.01):
+def _estimate_normals(points: np.ndarray, radius: float, max_nn: int = 30) -> np.ndarray:
     """
-    Remove small bumps and noise using voxel downsampling and reconstruction
+    Estimate point normals from local PCA over a hybrid radius/KNN neighborhood
+    
+    All neighborhoods are gathered with one batched Open3D tensor
+    hybrid search and the covariance eigen-decompositions run vectorized
+    over every point.
     
     Args:
-        mesh: Input triangle mesh
-        voxel_size: Size of voxels for downsampling (smaller = more detail)
+        points: (N, 3) array of point positions
+        radius: Neighborhood search radius
+        max_nn: Maximum number of neighbors per point
         
     Returns:
-        o3d.geometry.TriangleMesh: Cleaned mesh
+        np.ndarray: (N, 3) array of unit normals (unoriented)
     """
-    print(f"Removing noise with voxel size {voxel_size}...")
+    points_tensor = o3d.core.Tensor.from_numpy(np.ascontiguousarray(points))
+    nns = o3d.core.nns.NearestNeighborSearch(points_tensor)
+    nns.hybrid_index(radius)
+    indices, _, counts = nns.hybrid_search(points_tensor, radius=radius, max_knn=max_nn)
+    indices = indices.numpy()
+    counts = counts.numpy().reshape(-1, 1).astype(points.dtype)
+    
+    # Missing neighbors are padded with -1; mask them out
+    valid = indices >= 0
+    neighbors = points[np.where(valid, indices, 0)] * valid[..., None]
+    
+    centered = (neighbors - neighbors.sum(axis=1, keepdims=True) / counts[..., None]) * valid[..., None]
+    covariance = np.einsum('nkd,nke->nde', centered, centered)
+    
+    # eigh sorts eigenvalues ascending, so the first eigenvector is the normal
+    _, eigenvectors = np.linalg.eigh(covariance)
+    return eigenvectors[:, :, 0]
+
+
+def _remove_statistical_outliers(pcd: o3d.geometry.PointCloud, nb_neighbors: int = 20,
+                                 std_ratio: float = 2.0) -> o3d.geometry.PointCloud:
+    """
+    Remove points whose mean neighbor distance is unusually large
     
-    # Convert to voxel grid and back to smooth out small bumps
-    voxel_grid = o3d.geometry.VoxelGrid.create_from_triangle_mesh(mesh, voxel_size=voxel_size)
+    Equivalent to PointCloud.remove_statistical_outlier, but with a single
+    batched scipy KD-tree query over all points. Clouds with no more than
+    nb_neighbors points are too small for the statistics and are returned
+    unchanged.
+    
+    Args:
+        pcd: Input point cloud
+        nb_neighbors: Number of neighbors used for the mean distance
+        std_ratio: Threshold in standard deviations above the mean
+        
+    Returns:
+        o3d.geometry.PointCloud: Point cloud without the outliers
+    """
+    points = np.asarray(pcd.points)
+    if len(points) <= nb_neighbors:
+        return pcd
     
-    # Alternative: Use point cloud filtering
-    pcd = mesh.sample_points_uniformly(number_of_points=50000)
+    # Ask for one extra neighbor since each point is its own nearest neighbor
+    distances, _ = cKDTree(points).query(points, k=nb_neighbors + 1, workers=KDTREE_WORKERS)
+    mean_distances = distances[:, 1:].mean(axis=1)
+    keep = mean_distances < mean_distances.mean() + std_ratio * mean_distances.std()
     
-    # Remove statistical outliers (noise points)
-    pcd_filtered, _ = pcd.remove_statistical_outlier(nb_neighbors=20, std_ratio=2.0)
+    return pcd.select_by_index(np.nonzero(keep)[0])  # type: ignore[arg-type]
+
+
+def _mean_edge_length(vertices: np.ndarray, triangles: np.ndarray) -> float:
+    """
+    Mean length of the triangle edges of a mesh
+    
+    Args:
+        vertices: (N, 3) array of vertex positions
+        triangles: (F, 3) array of vertex indices
+        
+    Returns:
+        float: Mean edge length, 0.0 for a mesh without triangles
+    """
+    if len(triangles) == 0:
+        return 0.0
+    corners = vertices[triangles].astype(np.float64)
+    edges = np.roll(corners, -1, axis=1) - corners
+    return float(np.linalg.norm(edges, axis=2).mean())
+
+
+def estimate_noise(mesh: o3d.geometry.TriangleMesh) -> float:
+    """
+    Estimate surface noise from the high-frequency part of the cotangent
+    Laplacian
+    
+    Dividing L @ V by the diagonal of L gives each vertex's offset from the
+    weighted average of its neighbors. On a smooth surface that offset varies
+    slowly and cancels when the Laplacian is applied again, while noise does
+    not, so the residual tracks the noise amplitude independently of the
+    mesh resolution and scale.
+    
+    Args:
+        mesh: Input triangle mesh
+        
+    Returns:
+        float: Median per-vertex residual, relative to the mean edge length
+    """
+    vertices = np.asarray(mesh.vertices, dtype=np.float32)
+    triangles = np.asarray(mesh.triangles, dtype=np.int32)
     
-    # Estimate normals
-    pcd_filtered.estimate_normals(
-        search_param=o3d.geometry.KDTreeSearchParamHybrid(radius=voxel_size * 2, max_nn=30)
+    L = _laplacian_matrix(
+        np.ascontiguousarray(triangles).tobytes(),
+        np.ascontiguousarray(vertices).tobytes(),
+        len(vertices)
     )
+    diagonal = L.diagonal()
+    referenced = diagonal > 0
+    inv_diagonal = np.divide(1.0, diagonal, out=np.zeros_like(diagonal), where=referenced)[:, None]
     
-    # Reconstruct mesh using Poisson surface reconstruction
+    offsets = inv_diagonal * (L @ vertices)
+    residual = np.linalg.norm(inv_diagonal * (L @ offsets), axis=1)[referenced]
+    
+    mean_edge = _mean_edge_length(vertices, triangles)
+    return float(np.median(residual) / mean_edge) if mean_edge > 0 and len(residual) else 0.0
+
+
+def _vertex_normals(vertices: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    """
+    Compute area-weighted unit vertex normals
+    
+    Args:
+        vertices: (N, 3) array of vertex positions
+        triangles: (F, 3) array of vertex indices
+        
+    Returns:
+        np.ndarray: (N, 3) array of unit vertex normals
+    """
+    corners = vertices[triangles]
+    face_normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    
+    normals = np.stack([
+        np.bincount(triangles.ravel(), weights=np.repeat(face_normals[:, d], 3), minlength=len(vertices))
+        for d in range(3)
+    ], axis=1)
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    return (normals / np.maximum(lengths, np.finfo(np.float32).tiny)).astype(vertices.dtype)
+
+
+def _bilateral_denoise(mesh: o3d.geometry.TriangleMesh, sigma_c: float,
+                       iterations: int = 2) -> o3d.geometry.TriangleMesh:
+    """
+    Denoise a mesh in place on its own vertices with a bilateral filter
+    
+    Each vertex moves along its normal by a weighted mean of its neighbors'
+    offsets along that normal (Fleishman et al. 2003). Weights combine the
+    cotangent edge weight, spatial distance and normal offset, and are
+    applied as one sparse matrix product per pass.
+    
+    Args:
+        mesh: Input triangle mesh
+        sigma_c: Spatial kernel width, in the mesh's units
+        iterations: Number of filter passes
+        
+    Returns:
+        o3d.geometry.TriangleMesh: Denoised mesh with the input topology
+    """
+    vertices = np.asarray(mesh.vertices, dtype=np.float32)
+    triangles = np.asarray(mesh.triangles, dtype=np.int32)
+    n_verts = len(vertices)
+    
+    # The off-diagonal entries of the cached Laplacian are the edge list and
+    # its cotangent weights
+    L = _laplacian_matrix(
+        np.ascontiguousarray(triangles).tobytes(),
+        np.ascontiguousarray(vertices).tobytes(),
+        n_verts
+    ).tocoo()
+    off_diagonal = L.row != L.col
+    rows, cols = L.row[off_diagonal], L.col[off_diagonal]
+    cot_weights = -L.data[off_diagonal]
+    
+    V = vertices.copy()
+    for _ in range(iterations):
+        normals = _vertex_normals(V, triangles)
+        diff = V[cols] - V[rows]
+        t = np.linalg.norm(diff, axis=1)
+        h = np.einsum('ed,ed->e', normals[rows], diff)
+        sigma_s = max(float(h.std()), float(np.finfo(np.float32).eps))
+        
+        w = cot_weights * np.exp(-t ** 2 / (2 * sigma_c ** 2)) * np.exp(-h ** 2 / (2 * sigma_s ** 2))
+        K = sp.csr_matrix((w, (rows, cols)), shape=(n_verts, n_verts))
+        
+        # sum_j w_ij * n_i . (v_j - v_i) = n_i . (K @ V)_i - (K @ 1)_i * n_i . v_i
+        weight_sum = K @ np.ones(n_verts, dtype=V.dtype)
+        offset_sum = np.einsum('nd,nd->n', normals, K @ V) - weight_sum * np.einsum('nd,nd->n', normals, V)
+        offset = np.divide(offset_sum, weight_sum, out=np.zeros_like(offset_sum), where=weight_sum > 0)
+        V = V + normals * offset[:, None]
+    
+    mesh_denoised = o3d.geometry.TriangleMesh(mesh)
+    mesh_denoised.vertices = o3d.utility.Vector3dVector(V.astype(np.float64))
+    mesh_denoised.compute_vertex_normals()
+    return mesh_denoised
+
+
+def _poisson_reconstruct(mesh: o3d.geometry.TriangleMesh, voxel_size: float, depth: int | None,
+                         full_depth: int, samples_per_node: float,
+                         point_weight: float) -> o3d.geometry.TriangleMesh:
+    """
+    Rebuild the surface from filtered surface samples with screened Poisson
+    
+    Args:
+        mesh: Input triangle mesh
+        voxel_size: Target size of the finest octree cells
+        depth: Maximum octree depth for Poisson reconstruction; None picks
+            it so the finest octree cells are about voxel_size wide
+        full_depth: Octree depth below which the Poisson octree is complete
+        samples_per_node: Minimum number of points per Poisson octree node
+        point_weight: Screening weight for the Poisson interpolation term
+        
+    Returns:
+        o3d.geometry.TriangleMesh: Reconstructed mesh
+    """
+    # Sample the surface as a point cloud for filtering
+    n_samples = 50000
+    pcd = mesh.sample_points_uniformly(number_of_points=n_samples)
+    sample_spacing = float(np.sqrt(mesh.get_surface_area() / n_samples))
+    
+    # Remove statistical outliers (noise points)
+    pcd_filtered = _remove_statistical_outliers(pcd, nb_neighbors=20, std_ratio=2.0)
+    
+    # Estimate normals, flipping them to agree with the sampled mesh normals.
+    # The radius follows the sample density rather than voxel_size, so each
+    # neighborhood holds about 28 samples however the mesh is tessellated
+    points = np.asarray(pcd_filtered.points, dtype=np.float32)
+    normals = _estimate_normals(points, radius=sample_spacing * 3, max_nn=30)
+    if pcd_filtered.has_normals():
+        flip = np.einsum('nd,nd->n', normals, np.asarray(pcd_filtered.normals)) < 0
+        normals[flip] *= -1
+    pcd_filtered.normals = o3d.utility.Vector3dVector(normals.astype(np.float64))
+    
+    # Pick the octree depth so leaf cells are about voxel_size wide instead of
+    # a fixed depth that over-refines large clouds
+    if depth is None:
+        bbox = pcd_filtered.get_axis_aligned_bounding_box()
+        diagonal = float(np.linalg.norm(bbox.get_extent()))
+        depth = int(np.clip(np.log2(max(diagonal / voxel_size, 1.0)), 6, 10))
+    
+    # Reconstruct mesh using screened Poisson surface reconstruction
     mesh_reconstructed, densities = o3d.geometry.TriangleMesh.create_from_point_cloud_poisson(
-        pcd_filtered, depth=9
+        pcd_filtered,
+        depth=depth,
+        full_depth=full_depth,
+        samples_per_node=samples_per_node,
+        point_weight=point_weight
     )
     
-    # Remove low density vertices (artifacts from reconstruction)
-    vertices_to_remove = densities < np.quantile(densities, 0.01)
+    # Remove low density vertices (artifacts from reconstruction); a single
+    # 1% cutoff only needs a selection, not a full sort
+    density_values = np.asarray(densities)
+    k = int(0.01 * len(density_values))
+    threshold = np.partition(density_values, k)[k]
+    vertices_to_remove = density_values < threshold
     mesh_reconstructed.remove_vertices_by_mask(vertices_to_remove)
     
-    print("Noise removal complete")
     return mesh_reconstructed
 
 
-def make_print_ready(mesh):
+def remove_noise_and_bumps(mesh: o3d.geometry.TriangleMesh, voxel_size: float | None = None,
+                           depth: int | None = None, full_depth: int = 5,
+                           samples_per_node: float = 1.5, point_weight: float = 4.0,
+                           noise_threshold: float = 1e-2, method: str = 'bilateral',
+                           bilateral_iterations: int = 2) -> o3d.geometry.TriangleMesh:
+    """
+    Remove small bumps and noise
+    The 'bilateral' method filters the mesh's own vertices and keeps its
+    topology and texture; the 'poisson' method filters surface samples and
+    reconstructs a new surface
+    
+    Args:
+        mesh: Input triangle mesh
+        voxel_size: Feature size of the noise to remove (smaller = more
+            detail); None uses the mesh's mean edge length, so the filter
+            scales with the model
+        depth: Maximum octree depth for Poisson reconstruction; None picks
+            it so the finest octree cells are about voxel_size wide
+        full_depth: Octree depth below which the Poisson octree is complete
+        samples_per_node: Minimum number of points per Poisson octree node
+        point_weight: Screening weight for the Poisson interpolation term
+        noise_threshold: Skip denoising when the estimated noise
+            (relative to the mean edge length) is below this
+        method: Denoising method, 'bilateral' or 'poisson'
+        bilateral_iterations: Number of bilateral filter passes
+        
+    Returns:
+        o3d.geometry.TriangleMesh: Cleaned mesh
+    """
+    if voxel_size is None:
+        voxel_size = _mean_edge_length(np.asarray(mesh.vertices), np.asarray(mesh.triangles))
+    print(f"Removing noise with voxel size {voxel_size:.3g}...")
+    
+    # Denoising is expensive; leave already clean meshes untouched
+    noise = estimate_noise(mesh)
+    if noise < noise_threshold:
+        print(f"Estimated noise {noise:.2e} is below {noise_threshold:.2e}, skipping noise removal")
+        return mesh
+    
+    if method == 'bilateral':
+        mesh_cleaned = _bilateral_denoise(mesh, sigma_c=voxel_size, iterations=bilateral_iterations)
+    elif method == 'poisson':
+        mesh_cleaned = _poisson_reconstruct(mesh, voxel_size, depth, full_depth, samples_per_node, point_weight)
+    else:
+        raise ValueError(f"Unknown noise removal method: {method}")
+    
+    print("Noise removal complete")
+    return mesh_cleaned
+
+
+def make_print_ready(mesh: o3d.geometry.TriangleMesh) -> o3d.geometry.TriangleMesh:
     """
     Prepare mesh for 3D printing by ensuring it's watertight and manifold
     
@@ -140,32 +694,50 @@ def make_print_ready(mesh):
         # Fill holes (if any)
         # Note: Open3D doesn't have built-in hole filling, so we use other methods
     
-    # Ensure consistent vertex normals orientation
-    mesh.compute_vertex_normals()
+    # Ensure consistent triangle orientation; vertex normals are computed
+    # from the final winding by save_glb_model, and only if it writes them
     mesh.orient_triangles()
     
-    print(f"Mesh is watertight: {mesh.is_watertight()}")
-    print(f"Mesh is vertex manifold: {mesh.is_vertex_manifold()}")
-    print(f"Mesh is edge manifold: {mesh.is_edge_manifold()}")
+    # Each check walks the whole half-edge structure, so only pay for it
+    # when debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Mesh is watertight: {mesh.is_watertight()}")
+        logger.debug(f"Mesh is vertex manifold: {mesh.is_vertex_manifold()}")
+        logger.debug(f"Mesh is edge manifold: {mesh.is_edge_manifold()}")
     
     return mesh
 
 
-def save_glb_model(mesh, output_path):
+def save_glb_model(mesh: o3d.geometry.TriangleMesh, output_path: str | Path,
+                   write_normals: bool = False) -> None:
     """
     Save mesh as GLB file
     
     Args:
         mesh: Triangle mesh to save
         output_path: Path for output GLB file
+        write_normals: Whether to store vertex normals computed from the
+            final winding; without them glTF viewers shade the mesh flat,
+            so only drop them when a smaller file matters more than
+            smooth shading. The caller's mesh is left unchanged either way.
     """
     print(f"Saving model to {output_path}...")
     
     # Ensure the output directory exists
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
     
+    # Work on a copy so the caller's normals survive the export
+    if write_normals:
+        mesh = o3d.geometry.TriangleMesh(mesh)
+        mesh.compute_vertex_normals()
+    elif mesh.has_vertex_normals():
+        mesh = o3d.geometry.TriangleMesh(mesh)
+        mesh.vertex_normals = o3d.utility.Vector3dVector()
+    
     # Save as GLB
-    success = o3d.io.write_triangle_mesh(str(output_path), mesh)
+    success = o3d.io.write_triangle_mesh(
+        str(output_path), mesh, write_vertex_normals=write_normals  # type: ignore[arg-type]
+    )
     
     if success:
         print(f"Model successfully saved to {output_path}")
@@ -173,7 +745,8 @@ def save_glb_model(mesh, output_path):
         raise IOError(f"Failed to save model to {output_path}")
 
 
-def process_model(input_path, output_path, smooth_iterations=5, remove_bumps=True):
+def process_model(input_path: str | Path, output_path: str | Path, smooth_iterations: int = 5,
+                  remove_bumps: bool = True, write_normals: bool = True) -> bool:
     """
     Complete pipeline to smooth and prepare model for 3D printing
     
@@ -182,6 +755,7 @@ def process_model(input_path, output_path, smooth_iterations=5, remove_bumps=Tru
         output_path: Path for output GLB file
         smooth_iterations: Number of smoothing iterations
         remove_bumps: Whether to remove bumps and noise
+        write_normals: Whether to store vertex normals in the output GLB
         
     Returns:
         bool: Success status
@@ -201,7 +775,7 @@ def process_model(input_path, output_path, smooth_iterations=5, remove_bumps=Tru
         mesh = make_print_ready(mesh)
         
         # Save the result
-        save_glb_model(mesh, output_path)
+        save_glb_model(mesh, output_path, write_normals=write_normals)
         
         print("\n=== Processing Complete ===")
         print(f"Input: {input_path}")
@@ -0,0 +1,89 @@
+"""
+Numba kernels for mesh smoothing
+Kept in a separate module so model_smoother can be compiled with mypyc;
+Numba needs the plain Python bytecode of these functions to JIT them
+"""
+
+import numpy as np
+from numba import get_num_threads, njit, prange
+
+
+def cotan_smooth(V, F, iters, lam, mu):
+    """
+    Taubin smoothing with cotangent weights, parallelized over triangles
+    
+    Each thread scatters its share of triangles into a private accumulator;
+    the accumulators are reduced per vertex, so no atomics are needed.
+    
+    Args:
+        V: (N, 3) float32 array of vertex positions
+        F: (F, 3) int32 array of triangle indices
+        iters: Number of lambda/mu iteration pairs
+        lam: Shrinking step factor
+        mu: Inflation step factor (negative)
+        
+    Returns:
+        np.ndarray: (N, 3) array of smoothed vertex positions
+    """
+    # The thread count is read here rather than inside the kernel, which
+    # would keep Numba from caching the compiled code
+    return _cotan_smooth_kernel(V, F, iters, lam, mu, get_num_threads())
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _cotan_smooth_kernel(V, F, iters, lam, mu, n_chunks):
+    V = V.copy()
+    n_verts = V.shape[0]
+    n_tris = F.shape[0]
+    chunk_size = (n_tris + n_chunks - 1) // n_chunks
+    
+    delta = np.zeros((n_chunks, n_verts, 3))
+    weight_sum = np.zeros((n_chunks, n_verts))
+    
+    for step in range(2 * iters):
+        factor = lam if step % 2 == 0 else mu
+        delta[:] = 0.0
+        weight_sum[:] = 0.0
+        
+        for c in prange(n_chunks):
+            for t in range(c * chunk_size, min(n_tris, (c + 1) * chunk_size)):
+                for k in range(3):
+                    # Angle at corner i0 weights the opposite edge (i1, i2)
+                    i0 = F[t, k]
+                    i1 = F[t, (k + 1) % 3]
+                    i2 = F[t, (k + 2) % 3]
+                    ax = V[i1, 0] - V[i0, 0]
+                    ay = V[i1, 1] - V[i0, 1]
+                    az = V[i1, 2] - V[i0, 2]
+                    bx = V[i2, 0] - V[i0, 0]
+                    by = V[i2, 1] - V[i0, 1]
+                    bz = V[i2, 2] - V[i0, 2]
+                    dot = ax * bx + ay * by + az * bz
+                    cx = ay * bz - az * by
+                    cy = az * bx - ax * bz
+                    cz = ax * by - ay * bx
+                    cross_norm = np.sqrt(cx * cx + cy * cy + cz * cz)
+                    if cross_norm < 1e-12:
+                        continue
+                    w = 0.5 * dot / cross_norm
+                    if w <= 0.0:
+                        continue
+                    for d in range(3):
+                        edge = V[i2, d] - V[i1, d]
+                        delta[c, i1, d] += w * edge
+                        delta[c, i2, d] -= w * edge
+                    weight_sum[c, i1] += w
+                    weight_sum[c, i2] += w
+        
+        for i in prange(n_verts):
+            total = 0.0
+            for c in range(n_chunks):
+                total += weight_sum[c, i]
+            if total > 0.0:
+                for d in range(3):
+                    acc = 0.0
+                    for c in range(n_chunks):
+                        acc += delta[c, i, d]
+                    V[i, d] += factor * acc / total
+    
+    return V
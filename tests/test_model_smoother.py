@@ -0,0 +1,233 @@
+"""
+Regression tests for the numerical helpers in model_smoother
+Run with: python -m pytest tests
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("open3d")
+
+import open3d as o3d  # noqa: E402
+
+import model_smoother  # noqa: E402
+
+
+def icosphere(subdivisions=3, radius=1.0):
+    """
+    Build a unit icosphere by repeated midpoint subdivision
+
+    Args:
+        subdivisions: Number of subdivision passes
+        radius: Sphere radius
+
+    Returns:
+        tuple: (N, 3) float32 vertices and (F, 3) int32 triangles
+    """
+    t = (1 + 5 ** 0.5) / 2
+    vertices = [
+        [-1, t, 0], [1, t, 0], [-1, -t, 0], [1, -t, 0],
+        [0, -1, t], [0, 1, t], [0, -1, -t], [0, 1, -t],
+        [t, 0, -1], [t, 0, 1], [-t, 0, -1], [-t, 0, 1],
+    ]
+    vertices = [np.array(v, dtype=np.float64) / np.linalg.norm(v) for v in vertices]
+    triangles = [
+        [0, 11, 5], [0, 5, 1], [0, 1, 7], [0, 7, 10], [0, 10, 11],
+        [1, 5, 9], [5, 11, 4], [11, 10, 2], [10, 7, 6], [7, 1, 8],
+        [3, 9, 4], [3, 4, 2], [3, 2, 6], [3, 6, 8], [3, 8, 9],
+        [4, 9, 5], [2, 4, 11], [6, 2, 10], [8, 6, 7], [9, 8, 1],
+    ]
+
+    for _ in range(subdivisions):
+        midpoints = {}
+
+        def midpoint(a, b):
+            key = (min(a, b), max(a, b))
+            if key not in midpoints:
+                m = vertices[a] + vertices[b]
+                vertices.append(m / np.linalg.norm(m))
+                midpoints[key] = len(vertices) - 1
+            return midpoints[key]
+
+        subdivided = []
+        for a, b, c in triangles:
+            ab, bc, ca = midpoint(a, b), midpoint(b, c), midpoint(c, a)
+            subdivided += [[a, ab, ca], [b, bc, ab], [c, ca, bc], [ab, bc, ca]]
+        triangles = subdivided
+
+    return (np.array(vertices) * radius).astype(np.float32), np.array(triangles, dtype=np.int32)
+
+
+def as_mesh(vertices, triangles):
+    """Wrap vertex and triangle arrays in an Open3D triangle mesh"""
+    return o3d.geometry.TriangleMesh(
+        o3d.utility.Vector3dVector(vertices.astype(np.float64)),
+        o3d.utility.Vector3iVector(triangles)
+    )
+
+
+def radial_spread(vertices):
+    """Standard deviation of the vertex distances from the centroid"""
+    return float(np.linalg.norm(vertices - vertices.mean(axis=0), axis=1).std())
+
+
+@pytest.fixture(autouse=True)
+def isolated_laplacian_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_smoother, "LAPLACIAN_CACHE_DIR", tmp_path)
+    model_smoother._laplacian_matrix.cache_clear()
+    yield
+    model_smoother._laplacian_matrix.cache_clear()
+
+
+@pytest.fixture
+def noisy_sphere():
+    vertices, triangles = icosphere(3)
+    rng = np.random.default_rng(0)
+    noisy = vertices + (0.02 * rng.standard_normal(vertices.shape)).astype(np.float32)
+    return noisy, triangles
+
+
+def test_cotangent_laplacian_is_symmetric_with_zero_row_sums():
+    vertices, triangles = icosphere(2)
+    L = model_smoother._cotangent_laplacian(vertices, triangles)
+
+    assert abs(L - L.T).max() < 1e-6
+    assert np.abs(L @ np.ones(len(vertices))).max() < 1e-5
+    assert (L.diagonal() > 0).all()
+
+
+def test_cotangent_laplacian_is_scale_invariant_for_small_parts():
+    vertices, triangles = icosphere(4)
+    L = model_smoother._cotangent_laplacian(vertices, triangles)
+    L_small = model_smoother._cotangent_laplacian(0.005 * vertices, triangles)
+
+    assert L_small.dtype == np.float32
+    assert abs(L_small - L).max() < 1e-4 * abs(L).max()
+
+
+@pytest.fixture
+def sliver_sphere():
+    vertices, triangles = icosphere(4)
+    rng = np.random.default_rng(0)
+    for a, b, c in triangles[rng.choice(len(triangles), len(triangles) // 20, replace=False)]:
+        vertices[a] = 0.5 * (vertices[b] + vertices[c])
+    return vertices, triangles
+
+
+def test_cotangent_weights_are_bounded_on_sliver_triangles(sliver_sphere):
+    vertices, triangles = sliver_sphere
+    L = model_smoother._cotangent_laplacian(vertices, triangles)
+
+    assert L.diagonal().max() <= 6 * model_smoother.COTANGENT_MAX
+
+
+def test_implicit_smooth_stays_bounded_on_sliver_triangles(sliver_sphere):
+    vertices, triangles = sliver_sphere
+    smoothed = model_smoother._implicit_smooth(vertices, triangles, 5, 0.5)
+
+    radii = np.linalg.norm(smoothed - smoothed.mean(axis=0), axis=1)
+    assert radii.min() > 0.9 and radii.max() < 1.1
+
+
+def test_implicit_smooth_falls_back_when_the_solve_does_not_converge(noisy_sphere, monkeypatch):
+    vertices, triangles = noisy_sphere
+    monkeypatch.setattr(model_smoother, "CG_MAXITER", 1)
+
+    smoothed = model_smoother._implicit_smooth(vertices, triangles, 5, 0.5)
+
+    np.testing.assert_array_equal(smoothed, model_smoother._scipy_taubin(vertices, triangles, 5, 0.5, -0.51))
+
+
+@pytest.mark.parametrize("smooth", [
+    lambda V, F: model_smoother._implicit_smooth(V, F, 5, 0.5),
+    lambda V, F: model_smoother._scipy_taubin(V, F, 5, 0.5, -0.51),
+    lambda V, F: model_smoother.cotan_smooth(V, F, 5, 0.5, -0.51),
+], ids=["implicit", "scipy", "numba"])
+def test_smoothing_backends_reduce_noise_without_shrinking(noisy_sphere, smooth):
+    vertices, triangles = noisy_sphere
+    smoothed = smooth(vertices, triangles)
+
+    assert smoothed.shape == vertices.shape
+    assert radial_spread(smoothed) < 0.5 * radial_spread(vertices)
+
+    radius = np.linalg.norm(smoothed - smoothed.mean(axis=0), axis=1).mean()
+    assert radius == pytest.approx(1.0, abs=0.02)
+
+
+@pytest.mark.parametrize("subdivisions", [3, 5])
+@pytest.mark.parametrize("scale", [0.02, 100.0])
+def test_noise_estimate_is_independent_of_resolution_and_scale(subdivisions, scale):
+    vertices, triangles = icosphere(subdivisions, radius=scale)
+    mean_edge = model_smoother._mean_edge_length(vertices, triangles)
+    rng = np.random.default_rng(0)
+    noisy = vertices + 0.1 * mean_edge * rng.standard_normal(vertices.shape)
+
+    clean_noise = model_smoother.estimate_noise(as_mesh(vertices, triangles))
+    noisy_noise = model_smoother.estimate_noise(as_mesh(noisy, triangles))
+
+    assert clean_noise < 1e-2 < noisy_noise
+    assert noisy_noise == pytest.approx(0.1, rel=0.2)
+
+
+@pytest.mark.parametrize("scale", [0.02, 100.0])
+def test_bilateral_denoise_scales_with_the_mesh(scale):
+    vertices, triangles = icosphere(3, radius=scale)
+    mean_edge = model_smoother._mean_edge_length(vertices, triangles)
+    rng = np.random.default_rng(0)
+    noisy = vertices + 0.1 * mean_edge * rng.standard_normal(vertices.shape)
+
+    denoised = model_smoother.remove_noise_and_bumps(as_mesh(noisy, triangles))
+
+    assert radial_spread(np.asarray(denoised.vertices)) < 0.5 * radial_spread(noisy)
+
+
+def test_statistical_outlier_removal_keeps_tiny_clouds():
+    class Cloud:
+        points = np.random.default_rng(0).standard_normal((5, 3))
+
+    cloud = Cloud()
+    assert model_smoother._remove_statistical_outliers(cloud, nb_neighbors=20) is cloud
+
+
+def test_uniform_laplacian_leaves_unreferenced_vertices_in_place():
+    vertices, triangles = icosphere(2)
+    stray = np.array([[5.0, 5.0, 5.0]], dtype=np.float32)
+    vertices = np.vstack([vertices, stray])
+
+    smoothed = model_smoother._scipy_taubin(vertices, triangles, 5, 0.5, -0.51)
+
+    np.testing.assert_array_equal(smoothed[-1], stray[0])
+
+
+def test_only_persisted_laplacians_reach_the_disk_cache(noisy_sphere, tmp_path):
+    vertices, triangles = noisy_sphere
+    model_smoother.estimate_noise(as_mesh(vertices, triangles))
+    assert not list(tmp_path.glob("smoother_*.npz"))
+
+    model_smoother._implicit_smooth(vertices, triangles, 1, 0.5)
+    assert len(list(tmp_path.glob("smoother_*.npz"))) == 1
+
+
+def test_corrupt_laplacian_cache_entries_are_rebuilt(noisy_sphere, tmp_path):
+    vertices, triangles = noisy_sphere
+    model_smoother._implicit_smooth(vertices, triangles, 1, 0.5)
+    (entry,) = tmp_path.glob("smoother_*.npz")
+    entry.write_bytes(entry.read_bytes()[:100])
+    model_smoother._laplacian_matrix.cache_clear()
+
+    smoothed = model_smoother._implicit_smooth(vertices, triangles, 1, 0.5)
+
+    assert np.isfinite(smoothed).all()
+    assert entry.stat().st_size > 100
+
+
+def test_laplacian_cache_is_capped_by_total_bytes(noisy_sphere, tmp_path, monkeypatch):
+    vertices, triangles = noisy_sphere
+    model_smoother._implicit_smooth(vertices, triangles, 1, 0.5)
+    (entry,) = tmp_path.glob("smoother_*.npz")
+    monkeypatch.setattr(model_smoother, "LAPLACIAN_CACHE_MAX_BYTES", 2 * entry.stat().st_size)
+
+    for shift in range(1, 4):
+        model_smoother._implicit_smooth(vertices + np.float32(shift), triangles, 1, 0.5)
+
+    assert len(list(tmp_path.glob("smoother_*.npz"))) == 2